@@ -0,0 +1,38 @@
+"""add tasks owner_id/status index
+
+Owner-scoped status filters and the task statistics aggregate read
+(owner_id, status, priority), so including priority makes them index-only
+scans on Postgres.
+
+Revision ID: 2b8e5d0c7a14
+Revises: 7f3a2c91d4e0
+Create Date: 2026-10-15 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b8e5d0c7a14'
+down_revision: Union[str, Sequence[str], None] = '7f3a2c91d4e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_owner_id_status",
+        "tasks",
+        ["owner_id", "status"],
+        postgresql_include=["priority"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_owner_id_status", table_name="tasks", if_exists=True)
@@ -0,0 +1,35 @@
+"""add tasks owner_id/priority index
+
+Serves the priority filter on an owner's task list.
+
+Revision ID: 5c1d9e4f2b36
+Revises: 2b8e5d0c7a14
+Create Date: 2026-10-15 19:01:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1d9e4f2b36'
+down_revision: Union[str, Sequence[str], None] = '2b8e5d0c7a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_owner_id_priority",
+        "tasks",
+        ["owner_id", "priority"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_owner_id_priority", table_name="tasks", if_exists=True)
@@ -0,0 +1,54 @@
+"""create pg_trgm extension and task search trigram indexes
+
+The gin_trgm_ops indexes on tasks.title and tasks.description let Postgres
+serve the '%term%' ILIKE search, and need pg_trgm, which autogenerate never
+emits. Both are Postgres-only, so other dialects skip this revision.
+
+Revision ID: 7f3a2c91d4e0
+Revises:
+Create Date: 2026-10-15 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3a2c91d4e0'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_tasks_title_trgm",
+        "tasks",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_tasks_description_trgm",
+        "tasks",
+        ["description"],
+        postgresql_using="gin",
+        postgresql_ops={"description": "gin_trgm_ops"},
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.drop_index("ix_tasks_description_trgm", table_name="tasks", if_exists=True)
+    op.drop_index("ix_tasks_title_trgm", table_name="tasks", if_exists=True)
+    op.execute("DROP EXTENSION IF EXISTS pg_trgm")
@@ -0,0 +1,42 @@
+"""add tasks created_at BRIN index
+
+created_at grows with insertion order, so a BRIN index stays tiny and lets
+the /metrics recent-tasks subquery range-scan only recent blocks. BRIN is
+Postgres-only, so other dialects skip this revision.
+
+Revision ID: 9a4f6b2e8d51
+Revises: 5c1d9e4f2b36
+Create Date: 2026-10-15 19:02:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f6b2e8d51'
+down_revision: Union[str, Sequence[str], None] = '5c1d9e4f2b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.create_index(
+        "ix_tasks_created_at_brin",
+        "tasks",
+        ["created_at"],
+        postgresql_using="brin",
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != "postgresql":
+        return
+    op.drop_index("ix_tasks_created_at_brin", table_name="tasks", if_exists=True)
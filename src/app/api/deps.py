@@ -1,18 +1,29 @@
-from typing import AsyncGenerator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncGenerator, Optional, cast
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
+from jwt import PyJWTError
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import security
-from app.core.config import settings
 from app.core.database import AsyncSessionLocal
 from app.crud.user import user as crud_user
 from app.models.database import User
 
 reusable_oauth2 = HTTPBearer()
 
+@dataclass(slots=True)
+class CurrentUser:
+    """Plain snapshot of the authenticated user, so handlers read ints and strs instead of ORM attributes"""
+    id: int
+    username: str
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+    created_at: datetime
+
 async def get_db() -> AsyncGenerator[AsyncSession]:
     async with AsyncSessionLocal() as session:
         yield session
@@ -22,11 +33,9 @@ async def get_current_user(
     token: HTTPAuthorizationCredentials = Depends(reusable_oauth2)
 ) -> User:
     try:
-        payload = jwt.decode(
-            token.credentials, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
+        payload = security.decode_token(token.credentials)
         token_data = payload.get("sub")
-    except (JWTError, ValidationError):
+    except (PyJWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
@@ -42,7 +51,14 @@ async def get_current_user(
 
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
-) -> User:
+) -> CurrentUser:
     if not crud_user.is_active(current_user):
         raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
+    return CurrentUser(
+        id=cast(int, current_user.id),
+        username=cast(str, current_user.username),
+        email=cast(str, current_user.email),
+        full_name=cast(Optional[str], current_user.full_name),
+        is_active=cast(bool, current_user.is_active),
+        created_at=cast(datetime, current_user.created_at),
+    )
@@ -1,27 +1,54 @@
-import json
-from redis.asyncio import Redis, from_url  # type: ignore[attr-defined]
-from typing import Any, Optional
+import orjson
+from redis.asyncio import BlockingConnectionPool, Redis  # type: ignore[attr-defined]
+from redis.commands.core import AsyncScript
+from typing import Any, Optional, Sequence, cast
 import logging
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+SCAN_BATCH_SIZE = 500
+
+# Atomic fixed-window counter: the TTL is only set by the first hit, so the window
+# starts with it and the key expires on its own
+INCR_WITH_TTL_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
 class CacheManager:
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        max_connections: int = 50,
+        pool_timeout: int = 5,
+    ):
         self.redis_url: str = redis_url
-        self.redis_client: Optional[Redis[str]] = None  # type: ignore[type-arg]
+        self.max_connections: int = max_connections
+        self.pool_timeout: int = pool_timeout
+        self.redis_client: Optional[Redis[bytes]] = None  # type: ignore[type-arg]
+        self._incr_with_ttl: Optional[AsyncScript] = None
 
     async def connect(self) -> None:
         """Connect to Redis"""
         logger.info(f"Attempting to connect to Redis at {self.redis_url}")
         
         try:
-            self.redis_client = from_url(  # type: ignore[assignment]
-                url=self.redis_url,
-                encoding="utf8",
-                decode_responses=True
+            # Explicit pool so concurrent handlers get their own connections instead of
+            # queueing behind one; blocks up to pool_timeout when all are in use.
+            # Values are stored as orjson bytes, so skip decoding responses
+            pool = BlockingConnectionPool.from_url(
+                self.redis_url,
+                max_connections=self.max_connections,
+                timeout=self.pool_timeout,
             )
+            self.redis_client = Redis.from_pool(pool)  # type: ignore[assignment]
             await self.redis_client.ping()  # type: ignore[misc]
+            # Runs via EVALSHA, reloading the script if Redis doesn't have it cached
+            self._incr_with_ttl = self.redis_client.register_script(INCR_WITH_TTL_SCRIPT)  # type: ignore[union-attr]
             logger.info("✅ Connected to Redis successfully")
         except Exception as e:
             logger.error(f"❌ Failed to connect to Redis: {e}")
@@ -33,6 +60,17 @@ class CacheManager:
         if self.redis_client:
             await self.redis_client.close()  # type: ignore[misc]
 
+    async def ping(self) -> bool:
+        """Check that Redis answers, in a single round-trip"""
+        if not self.redis_client:
+            return False
+
+        try:
+            return bool(await self.redis_client.ping())  # type: ignore[misc]
+        except Exception as e:
+            logger.error(f"Cache ping error: {e}")
+            return False
+
     async def get(self, key: str) -> Any:
         """Get value from cache"""
         if not self.redis_client:
@@ -41,7 +79,7 @@ class CacheManager:
         try:
             value = await self.redis_client.get(key)  # type: ignore[misc]
             if value:
-                return json.loads(value)
+                return orjson.loads(value)
         except Exception as e:
             logger.error(f"Cache get error for key {key}: {e}")
         return None
@@ -52,13 +90,36 @@ class CacheManager:
             return False
 
         try:
-            json_value = json.dumps(value, default=str)
+            json_value = orjson.dumps(value, default=str)
             await self.redis_client.setex(key, ttl, json_value)  # type: ignore[misc]
             return True
         except Exception as e:
             logger.error(f"Cache set error for key {key}: {e}")
             return False
 
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get an already-serialized value from cache, as stored"""
+        if not self.redis_client:
+            return None
+
+        try:
+            return cast(Optional[bytes], await self.redis_client.get(key))
+        except Exception as e:
+            logger.error(f"Cache get error for key {key}: {e}")
+        return None
+
+    async def set_bytes(self, key: str, value: bytes, ttl: int = 3600) -> bool:
+        """Set an already-serialized value in cache with TTL"""
+        if not self.redis_client:
+            return False
+
+        try:
+            await self.redis_client.setex(key, ttl, value)  # type: ignore[misc]
+            return True
+        except Exception as e:
+            logger.error(f"Cache set error for key {key}: {e}")
+            return False
+
     async def delete(self, key: str) -> bool:
         """Delete key from cache"""
         if not self.redis_client:
@@ -71,21 +132,49 @@ class CacheManager:
             logger.error(f"Cache delete error for key {key}: {e}")
             return False
 
+    async def incr_with_ttl(self, key: str, ttl: int) -> Optional[int]:
+        """Increment a counter, starting its TTL on first use, in a single round-trip"""
+        if not self.redis_client or not self._incr_with_ttl:
+            return None
+
+        try:
+            count = await self._incr_with_ttl(keys=[key], args=[ttl])
+            return int(count)
+        except Exception as e:
+            logger.error(f"Cache incr error for key {key}: {e}")
+            return None
+
     async def clear_pattern(self, pattern: str) -> int:
         """Clear all keys matching pattern"""
+        return await self.invalidate(patterns=[pattern])
+
+    async def invalidate(self, keys: Sequence[str] = (), patterns: Sequence[str] = ()) -> int:
+        """Delete keys and all keys matching patterns, sharing UNLINK round-trips between them"""
         if not self.redis_client:
             return 0
 
+        # SCAN instead of KEYS so Redis isn't blocked walking the whole keyspace,
+        # and UNLINK so the memory is reclaimed in a background thread.
+        # Keys are unlinked in batches as the scans produce them, so memory stays
+        # bounded by one batch; a partial batch carries over to the next pattern
+        deleted = 0
         try:
-            keys = await self.redis_client.keys(pattern)  # type: ignore[misc]
-            if keys:
-                return await self.redis_client.delete(*keys)  # type: ignore[misc]
+            batch: list[str | bytes] = list(keys)
+            for pattern in patterns:
+                async for key in self.redis_client.scan_iter(match=pattern, count=SCAN_BATCH_SIZE):  # type: ignore[misc]
+                    batch.append(key)
+                    if len(batch) >= SCAN_BATCH_SIZE:
+                        deleted += await self.redis_client.unlink(*batch)  # type: ignore[misc]
+                        batch.clear()
+            if batch:
+                deleted += await self.redis_client.unlink(*batch)  # type: ignore[misc]
         except Exception as e:
-            logger.error(f"Cache clear pattern error for {pattern}: {e}")
-        return 0
+            logger.error(f"Cache invalidate error for {keys} / {patterns}: {e}")
+        return deleted
 
 # Global cache manager instance
 cache_manager = CacheManager(
-    redis_url= settings.REDIS_URL
-    
+    redis_url= settings.REDIS_URL,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    pool_timeout=settings.REDIS_POOL_TIMEOUT,
 )
\ No newline at end of file
@@ -1,14 +1,31 @@
 """
     Database configuration and connection setup.
 """
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from app.core.config import settings
 
 
+# asyncpg prepares every statement; larger caches let hot queries skip
+# re-preparing (and re-planning) them on each pooled connection.
+connect_args: dict[str, Any] = {}
+if make_url(settings.DATABASE_URL).get_driver_name() == "asyncpg":
+    connect_args = {
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+
 # Engine : Engine is used to manage the connection pool to the database.
-engine = create_async_engine(url=settings.DATABASE_URL, echo=True)
+# SQL echo logs every statement, so it is only enabled in DEBUG.
+engine = create_async_engine(
+    url=settings.DATABASE_URL,
+    echo=settings.DEBUG,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    connect_args=connect_args,
+)
 
 # Session Local : This is a factory for creating new AsyncSession instances.
 AsyncSessionLocal = async_sessionmaker(
@@ -1,9 +1,12 @@
+import asyncio
 import functools
 import hashlib
+import inspect
 import json
 import logging
 from typing import Callable, TypeVar, ParamSpec, Awaitable, Any
 from enum import Enum
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.cache import cache_manager
 
 # Type variables for proper decorator typing
@@ -12,6 +15,61 @@ R = TypeVar('R')    # Captures return type
 
 logger = logging.getLogger(__name__)
 
+# In-flight computations per cache key, so concurrent misses share one call
+_inflight: dict[str, asyncio.Future[Any]] = {}
+
+# Background cache writes, strongly referenced until done so they aren't garbage collected
+_background_writes: set[asyncio.Task[bool]] = set()
+
+def _serialize_none(value: None) -> str:
+    return "None"
+
+def _serialize_enum(value: Enum) -> str:
+    return str(value.value)
+
+def _serialize_sequence(value: list[Any] | tuple[Any, ...]) -> str:
+    return json.dumps([_serialize_value(v) for v in value], sort_keys=True)
+
+def _serialize_mapping(value: dict[Any, Any]) -> str:
+    return json.dumps({k: _serialize_value(v) for k, v in value.items()}, sort_keys=True)
+
+def _skip_value(value: Any) -> str:
+    return ""  # Don't include value in cache key
+
+# Serializer per concrete type. Types not listed here are resolved once by
+# _resolve_serializer and added, so each call is a single dict lookup.
+_SERIALIZERS: dict[type, Callable[[Any], str]] = {
+    type(None): _serialize_none,
+    str: str,
+    int: str,
+    float: str,
+    bool: str,
+    list: _serialize_sequence,
+    tuple: _serialize_sequence,
+    dict: _serialize_mapping,
+}
+
+def _resolve_serializer(cls: type) -> Callable[[Any], str]:
+    """Pick the serializer for a type not yet in _SERIALIZERS and remember it"""
+    serializer: Callable[[Any], str]
+    # Skip database sessions (matched by type - any class merely named "...Session" is kept)
+    if issubclass(cls, AsyncSession):
+        serializer = _skip_value
+    # Enums use their value (checked before str, since str enums are both)
+    elif issubclass(cls, Enum):
+        serializer = _serialize_enum
+    elif issubclass(cls, (str, int, float, bool)):
+        serializer = str
+    elif issubclass(cls, (list, tuple)):
+        serializer = _serialize_sequence
+    elif issubclass(cls, dict):
+        serializer = _serialize_mapping
+    else:
+        # Fallback: try to convert to string
+        serializer = str
+    _SERIALIZERS[cls] = serializer
+    return serializer
+
 def _serialize_value(value: Any) -> str:
     """
     Serialize a value to a deterministic string for cache key generation.
@@ -22,73 +80,102 @@ def _serialize_value(value: Any) -> str:
     - None values
     - Lists, dicts, and primitives
     """
-    if value is None:
-        return "None"
-    
-    # Skip database sessions and other non-serializable objects
-    if hasattr(value, '__class__'):
-        class_name = value.__class__.__name__
-        if 'Session' in class_name or 'AsyncSession' in class_name:
-            return ""  # Don't include session in cache key
-    
-    # Handle Enums - use their value
-    if isinstance(value, Enum):
-        return str(value.value)
-    
-    # Handle primitives
-    if isinstance(value, (str, int, float, bool)):
-        return str(value)
-    
-    # Handle None
-    if value is None:
-        return "None"
-    
-    # Handle lists/tuples
-    if isinstance(value, (list, tuple)):
-        return json.dumps([_serialize_value(v) for v in value], sort_keys=True)  # type: ignore[misc]
-    
-    # Handle dicts
-    if isinstance(value, dict):
-        return json.dumps({k: _serialize_value(v) for k, v in value.items()}, sort_keys=True)  # type: ignore[misc]
-    
-    # Fallback: try to convert to string
-    return str(value)
+    cls = type(value)
+    serializer = _SERIALIZERS.get(cls) or _resolve_serializer(cls)
+    return serializer(value)
 
-def _generate_cache_key(func_name: str, key_prefix: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+def _skipped_params(func: Callable[..., Any]) -> tuple[frozenset[int], frozenset[str]]:
+    """
+    Find the parameters of func that must not be part of its cache key.
+
+    Returns the positional indices and names of 'self' and any parameter
+    annotated as AsyncSession. Computed once per decorated function.
+    """
+    indices: set[int] = set()
+    names: set[str] = set()
+    for idx, (name, param) in enumerate(inspect.signature(func).parameters.items()):
+        if name == 'self' or param.annotation is AsyncSession:
+            names.add(name)
+            if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+                indices.add(idx)
+    return frozenset(indices), frozenset(names)
+
+def _scope_default(func: Callable[..., Any], scope: str) -> Any:
+    """
+    Check that scope names a keyword-only parameter of func and return its default.
+
+    Keyword-only guarantees the value is always found in kwargs (or defaulted),
+    so the readable part of the key can't silently become "None".
+    """
+    param = inspect.signature(func).parameters.get(scope)
+    if param is None or param.kind is not param.KEYWORD_ONLY:
+        raise TypeError(
+            f"cache_result scope {scope!r} must be a keyword-only parameter of {func.__qualname__}"
+        )
+    return None if param.default is param.empty else param.default
+
+def _generate_cache_key(
+    func_name: str,
+    key_prefix: str,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    skip_indices: frozenset[int] = frozenset(),
+    skip_names: frozenset[str] = frozenset(),
+) -> str:
     """
     Generate a deterministic cache key from function arguments.
     
-    Skips the first argument if it's a 'self' instance.
+    Skips the positional indices and keyword names given in skip_indices
+    and skip_names (e.g. 'self' and database sessions).
     """
-    key_parts = [key_prefix, func_name]
-    
-    # Process args (skip 'self' if it's the first argument)
-    start_idx = 1 if args and hasattr(args[0], '__class__') and hasattr(args[0].__class__, '__mro__') else 0
-    for arg in args[start_idx:]:
+    # Feed each part straight into the hasher instead of joining an intermediate string
+    # (BLAKE2b is much faster than MD5; 16 bytes keeps the 128-bit width)
+    hasher = hashlib.blake2b(key_prefix.encode(), digest_size=16)
+    hasher.update(b":")
+    hasher.update(func_name.encode())
+    
+    # Process args
+    for idx, arg in enumerate(args):
+        if idx in skip_indices:
+            continue
         serialized = _serialize_value(arg)
         if serialized:  # Only add non-empty serializations
-            key_parts.append(serialized)
+            hasher.update(b":")
+            hasher.update(serialized.encode())
     
     # Process kwargs in sorted order for consistency
     for key in sorted(kwargs.keys()):
-        value = kwargs[key]
-        serialized = _serialize_value(value)
+        if key in skip_names:
+            continue
+        serialized = _serialize_value(kwargs[key])
         if serialized:  # Only add non-empty serializations
-            key_parts.append(f"{key}={serialized}")
-    
-    # Join all parts and create hash
-    cache_key_data = ":".join(key_parts)
-    cache_key = hashlib.md5(cache_key_data.encode()).hexdigest()
+            hasher.update(b":")
+            hasher.update(key.encode())
+            hasher.update(b"=")
+            hasher.update(serialized.encode())
     
-    return cache_key
+    return hasher.hexdigest()
 
-def cache_result(ttl: int = 3600, key_prefix: str = "") -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+def _release_inflight(cache_key: str, future: asyncio.Future[Any]) -> None:
+    if _inflight.get(cache_key) is future:
+        del _inflight[cache_key]
+
+def cache_result(
+    ttl: int = 3600,
+    key_prefix: str = "",
+    scope: str | None = None,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
     """
     Decorator to cache async function results.
     
+    None results are never cached, since they read back as a cache miss.
+    
     Args:
         ttl: Time to live for cached results in seconds (default: 3600)
         key_prefix: Prefix for cache keys (default: "")
+        scope: Keyword-only argument kept readable in the key as
+            "{key_prefix}:{value}:{hash}", so all entries for one value can be
+            invalidated with clear_pattern("{key_prefix}:{value}:*") (default: None)
     
     Returns:
         Decorator function that wraps async functions with caching
@@ -99,10 +186,17 @@ def cache_result(ttl: int = 3600, key_prefix: str = "") -> Callable[[Callable[P,
             return await fetch_user(user_id)
     """
     def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        skip_indices, skip_names = _skipped_params(func)
+        scope_default = _scope_default(func, scope) if scope is not None else None
+
         @functools.wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
             # Generate deterministic cache key
-            cache_key = _generate_cache_key(func.__name__, key_prefix, args, kwargs)  # type: ignore[arg-type]
+            cache_key = _generate_cache_key(
+                func.__name__, key_prefix, args, kwargs, skip_indices, skip_names  # type: ignore[arg-type]
+            )
+            if scope is not None:
+                cache_key = f"{key_prefix}:{kwargs.get(scope, scope_default)}:{cache_key}"
             logger.info(f"🔑 Cache key: {cache_key} for {func.__name__}")
 
             # Try to get from cache
@@ -113,10 +207,42 @@ def cache_result(ttl: int = 3600, key_prefix: str = "") -> Callable[[Callable[P,
         
             logger.info(f"❌ Cache MISS for {func.__name__}")
 
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            success = await cache_manager.set(cache_key, result, ttl)  # type: ignore[arg-type]
-            logger.info(f"Cache set success: {success} for key: {cache_key}")
+            # Another request is already computing this key - wait for its result
+            while (inflight := _inflight.get(cache_key)) is not None:
+                logger.info(f"⏳ Awaiting in-flight result for {func.__name__}")
+                try:
+                    return await asyncio.shield(inflight)  # type: ignore[no-any-return]
+                except asyncio.CancelledError:
+                    # Only propagate if this request was cancelled; if the leading one was,
+                    # look again - the first waiter to get here computes the result itself
+                    task = asyncio.current_task()
+                    if not inflight.cancelled() or (task is not None and task.cancelling()):
+                        raise
+                    logger.info(f"🔁 In-flight call for {func.__name__} was cancelled, retrying")
+
+            future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+            _inflight[cache_key] = future
+            try:
+                # Execute function
+                result = await func(*args, **kwargs)
+                future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()  # mark retrieved; waiters still receive it
+                raise
+            finally:
+                if not future.done():
+                    future.cancel()
+                # Release before the cache write, so a read that arrives after an
+                # invalidation queries again instead of reusing this result
+                _release_inflight(cache_key, future)
+
+            if result is not None:
+                # Write in the background so the miss doesn't wait on the SETEX round-trip
+                write = asyncio.create_task(cache_manager.set(cache_key, result, ttl))
+                _background_writes.add(write)
+                write.add_done_callback(_background_writes.discard)
 
             return result
         return wrapper
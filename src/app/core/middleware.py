@@ -0,0 +1,77 @@
+import logging
+import random
+from typing import Sequence
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+_EMOJIS = ["🚀", "🔥", "✨", "🌟", "💥", "🎉", "😄", "🤖", "👾", "🛠️"]
+# Log lines are built once instead of on every request
+_EMOJI_LINES = [f" {" ".join(list(emoji * 3))} " for emoji in _EMOJIS]
+
+
+class EmojiLoggingMiddleware:
+    """Log a random emoji line for every HTTP request.
+
+    Pure ASGI: unlike @app.middleware("http") it doesn't wrap the request and
+    response in Starlette objects or run call_next in a separate task.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            logger.info(random.choice(_EMOJI_LINES))
+        await self.app(scope, receive, send)
+
+
+class BodySizeLimitMiddleware:
+    """Reject request bodies over max_body_size on the given path prefixes with a 413.
+
+    A declared Content-Length over the limit is refused before any of the body is
+    read; otherwise the received chunks are counted and reading stops at the limit.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int, path_prefixes: Sequence[str]):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_prefixes = tuple(path_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_body_size:
+                    response = JSONResponse(
+                        {"detail": self._detail()},
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    )
+                    await response(scope, receive, send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # FastAPI re-raises HTTPExceptions from body parsing, so this becomes a 413 response
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=self._detail(),
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def _detail(self) -> str:
+        return f"Request body exceeds the maximum size of {self.max_body_size} bytes"
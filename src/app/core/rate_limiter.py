@@ -1,4 +1,3 @@
-import time
 import logging
 from fastapi import HTTPException, Request, status
 from app.core.cache import cache_manager
@@ -13,29 +12,24 @@ class RateLimiter:
 
     async def is_allowed(self, identifier: str) -> bool:
         """Check if request is allowed using fixed window"""
-        current_time = int(time.time())
-        # Use fixed window start based on window_seconds intervals
-        # This ensures the same window_start for all requests within the same time window
-        window_start = (current_time // self.window_seconds) * self.window_seconds
-
-        # Generate consistent key for the current time window
-        key = f"rate_limit:{identifier}:{window_start}"
+        # The window starts with the first request and ends when the key expires
+        key = f"rate_limit:{identifier}"
         logger.info(f"🔑 Rate limit key: {key}")
         
-        # Get current request count for this window
-        count_data = await cache_manager.get(key)
-        current_count = count_data if isinstance(count_data, int) else 0
-        
+        # Increment and read the counter in one atomic round-trip,
+        # so concurrent requests can't both observe the same count
+        current_count = await cache_manager.incr_with_ttl(key, self.window_seconds)
+        if current_count is None:
+            # Cache unavailable - fail open
+            return True
+
         logger.info(f"📊 Current count: {current_count}/{self.max_requests} for {identifier}")
 
-        if current_count >= self.max_requests:
+        if current_count > self.max_requests:
             logger.warning(f"🚫 Rate limit exceeded for {identifier}")
             return False
 
-        # Increment counter with TTL to auto-expire
-        new_count = current_count + 1
-        await cache_manager.set(key, new_count, self.window_seconds)
-        logger.info(f"✅ Request allowed ({new_count}/{self.max_requests}) for {identifier}")
+        logger.info(f"✅ Request allowed ({current_count}/{self.max_requests}) for {identifier}")
         return True
 
     async def __call__(self, request: Request) -> None:
@@ -1,31 +1,45 @@
 from datetime import datetime, timedelta, timezone
 from typing import Any, Union
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import jwt
+from jwt import PyJWTError
+import bcrypt
 from app.core.config import settings
 import uuid
 from app.models.database import RefreshToken
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Same cost factor passlib used, so existing hashes and timings are unchanged
+BCRYPT_ROUNDS = 12
 
 ALGORITHM = "HS256"
 
+# Encode the signing key and build the algorithm list once, not on every sign/verify
+_SECRET_KEY = settings.SECRET_KEY.encode()
+_ALGORITHMS = [ALGORITHM]
+
+# Token lifetimes, built once from settings
+ACCESS_TOKEN_EXPIRES = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+REFRESH_TOKEN_EXPIRES = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+
+def decode_token(token: str) -> dict[str, Any]:
+    """Verify a JWT's signature and expiry and return its payload. Raises PyJWTError."""
+    return jwt.decode(token, _SECRET_KEY, algorithms=_ALGORITHMS)
+
 async def create_refresh_token(subject: str, db: AsyncSession, old_rt: RefreshToken | None = None) -> str:
     try:
         if old_rt:
-            # Revoke the old refresh token
+            # Revoke the old refresh token (committed together with the new one below)
             old_rt.revoked = True
-            await db.commit()
-        
+
         jti = str(uuid.uuid4())
 
         # Use timezone-aware datetime
-        expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        expire = datetime.now(timezone.utc) + REFRESH_TOKEN_EXPIRES
         to_encode : dict[str, Any] = {"exp": expire, "sub": str(subject), "jti": jti}
 
-        encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+        encoded_jwt = jwt.encode(to_encode, _SECRET_KEY, algorithm=ALGORITHM)
 
         rt = RefreshToken(
             jti=jti,
@@ -45,21 +59,22 @@ async def create_refresh_token(subject: str, db: AsyncSession, old_rt: RefreshTo
     
 async def verify_refresh_token(token: str, db: AsyncSession) -> Union[RefreshToken, None]:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[ALGORITHM]
-        )
+        payload = decode_token(token)
         jti: Any = payload.get("jti")
         user_id: Any = payload.get("sub")
         if jti is None or user_id is None:
             return None
         
-        rt = await db.get(RefreshToken, jti)
-        # Fix: Use timezone-aware datetime for comparison
-        if rt is None or rt.revoked or rt.expiry_date < datetime.now(timezone.utc):
-            return None
-        
-        return rt
-    except JWTError:
+        # Let the database filter out revoked and expired tokens in the same lookup
+        result = await db.execute(
+            select(RefreshToken).where(
+                RefreshToken.jti == jti,
+                RefreshToken.revoked.is_(False),
+                RefreshToken.expiry_date > datetime.now(timezone.utc),
+            )
+        )
+        return result.scalar_one_or_none()
+    except PyJWTError:
         return None
 
 def create_access_token(
@@ -69,26 +84,21 @@ def create_access_token(
         # Use timezone-aware datetime
         expire = datetime.now(timezone.utc) + expires_delta
     else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+        expire = datetime.now(timezone.utc) + ACCESS_TOKEN_EXPIRES
     to_encode : dict[str, Any] = {"exp": expire, "sub": str(subject)}
 
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 def verify_token(token: str) -> Union[str, None]:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[ALGORITHM]
-        )
-        print("Payload: ", payload)
+        payload = decode_token(token)
         return payload.get("sub")
-    except JWTError:
+    except PyJWTError:
         return None
@@ -52,6 +52,12 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     async def remove(self, db: AsyncSession, *, id: int) -> ModelType | None:
         obj = await self.get(db, id)
-        await db.delete(obj)
+        if obj is None:
+            return None
+        return await self.remove_obj(db, db_obj=obj)
+
+    async def remove_obj(self, db: AsyncSession, *, db_obj: ModelType) -> ModelType:
+        """Delete an object the caller already loaded, without fetching it again"""
+        await db.delete(db_obj)
         await db.commit()
-        return obj
+        return db_obj
@@ -1,14 +1,14 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import ColumnElement, select, func, or_, and_
+from sqlalchemy import ColumnElement, Select, case, select, func, or_, and_
 from app.crud.base import CRUDBase
 from app.models.database import Task
 from app.models.task import TaskCreate, TaskUpdate, TaskPriority, TaskStatus
 from app.core.decorators import cache_result
 
 class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
-    @cache_result(ttl=300, key_prefix="tasks_by_owner")
+    @cache_result(ttl=300, key_prefix="tasks_by_owner", scope="owner_id")
     async def get_tasks_by_owner_cached(
         self,
         db: AsyncSession,
@@ -20,11 +20,22 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         status: Optional[TaskStatus] = None,
         search: Optional[str] = None
     ) -> tuple[list[dict[str, str | int | datetime]], int]:
-        """Get tasks with caching and full-text search"""
+        """Get tasks with caching and trigram-indexed search"""
 
-        # Build base query with eager loading
-        query = select(Task).where(Task.owner_id == owner_id)
-        count_query = select(func.count(Task.id)).where(Task.owner_id == owner_id)
+        # Select plain columns - the result is cached as dicts, so skip ORM instance hydration
+        query: Select[Any] = select(
+            Task.id,
+            Task.title,
+            Task.description,
+            Task.priority,
+            Task.status,
+            Task.due_date,
+            Task.created_at,
+            Task.updated_at,
+            Task.owner_id,
+            # Total matching rows (before LIMIT/OFFSET) on every row, saving a separate COUNT round-trip
+            func.count().over().label("total_count"),
+        ).where(Task.owner_id == owner_id)
 
         # Apply filters
         conditions : list[ColumnElement[bool]] = [] 
@@ -33,6 +44,7 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         if status:
             conditions.append(Task.status == status)
         if search:
+            # ILIKE '%term%' is served by the pg_trgm GIN indexes on title/description
             search_condition = or_(
                 Task.title.ilike(f"%{search}%"),
                 Task.description.ilike(f"%{search}%")
@@ -41,32 +53,24 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
 
         if conditions:
             query = query.where(and_(*conditions))
-            count_query = count_query.where(and_(*conditions))
-
-        # Execute count query
-        count_result = await db.execute(count_query)
-        total_count : int = count_result.scalar() or 0
 
         # Execute main query with pagination
         query = query.offset(skip).limit(limit).order_by(Task.created_at.desc())
         result = await db.execute(query)
-        tasks = result.scalars().all()
-    
+        rows = result.mappings().all()
+
+        total_count : int = rows[0]["total_count"] if rows else 0
+        if not rows and skip > 0:
+            # Page past the end returns no rows to read the window count from
+            count_query = select(func.count(Task.id)).where(Task.owner_id == owner_id, *conditions)
+            count_result = await db.execute(count_query)
+            total_count = count_result.scalar() or 0
+
         # Convert to dict for caching
         task_dicts : list[dict[str, str | int | datetime]] = [
-            {
-                "id": task.id,
-                "title": task.title,
-                "description": task.description,
-                "priority": task.priority,
-                "status": task.status,
-                "due_date": task.due_date,
-                "created_at": task.created_at,
-                "updated_at": task.updated_at,
-                "owner_id": task.owner_id
-            }
-            for task in tasks
-        ] # type: ignore[var-annotated]
+            {key: value for key, value in row.items() if key != "total_count"}
+            for row in rows
+        ]
 
         return task_dicts, total_count
 
@@ -81,17 +85,18 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
         await db.refresh(db_obj)
         return db_obj
     
+    @cache_result(ttl=30, key_prefix="stats", scope="owner_id")
     async def get_task_statistics(
         self, db: AsyncSession, *, owner_id: int
     ) -> dict[str, int]:
         """Get task statistics for dashboard"""
         query = select(
             func.count(Task.id).label("total_tasks"),
-            func.sum(func.case((Task.status == TaskStatus.COMPLETED, 1), else_=0)).label("completed_tasks"),
-            func.sum(func.case((Task.status == TaskStatus.PENDING, 1), else_=0)).label("pending_tasks"),
-            func.sum(func.case((Task.status == TaskStatus.IN_PROGRESS, 1), else_=0)).label("in_progress_tasks"),
-            func.sum(func.case((Task.priority == TaskPriority.HIGH, 1), else_=0)).label("high_priority_tasks"),
-            func.sum(func.case((Task.priority == TaskPriority.URGENT, 1), else_=0)).label("urgent_tasks"),
+            func.sum(case((Task.status == TaskStatus.COMPLETED, 1), else_=0)).label("completed_tasks"),
+            func.sum(case((Task.status == TaskStatus.PENDING, 1), else_=0)).label("pending_tasks"),
+            func.sum(case((Task.status == TaskStatus.IN_PROGRESS, 1), else_=0)).label("in_progress_tasks"),
+            func.sum(case((Task.priority == TaskPriority.HIGH, 1), else_=0)).label("high_priority_tasks"),
+            func.sum(case((Task.priority == TaskPriority.URGENT, 1), else_=0)).label("urgent_tasks"),
         ).where(Task.owner_id == owner_id)
 
         result = await db.execute(query)
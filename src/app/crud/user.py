@@ -1,6 +1,8 @@
+import asyncio
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Insert, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
 from app.crud.base import CRUDBase
 from app.models.database import User
 from app.models.user import UserCreate, UserUpdate
@@ -15,25 +17,66 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         result = await db.execute(select(User).where(User.username == username))
         return result.scalar_one_or_none()
 
+    async def get_by_email_or_username(
+        self, db: AsyncSession, *, email: str, username: str
+    ) -> Optional[User]:
+        """Find a user matching either field in one query, preferring an email match"""
+        result = await db.execute(
+            select(User)
+            .where(or_(User.email == email, User.username == username))
+            .order_by((User.email == email).desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
     async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        # bcrypt is deliberately slow and releases the GIL, so hash off the event loop
+        hashed_password = await asyncio.to_thread(get_password_hash, obj_in.password)
         db_obj = User(
             email=obj_in.email,
             username=obj_in.username,
             full_name=obj_in.full_name,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=hashed_password,
         )
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
         return db_obj
 
+    async def create_if_absent(self, db: AsyncSession, *, obj_in: UserCreate) -> Optional[User]:
+        """
+        Insert a user with ON CONFLICT DO NOTHING in a single round-trip, reading
+        server defaults back via RETURNING.
+        Returns None if the email or username is already taken.
+        """
+        hashed_password = await asyncio.to_thread(get_password_hash, obj_in.password)
+        # The app runs on Postgres and the tests on SQLite; both support ON CONFLICT ... RETURNING
+        stmt: Insert
+        if db.get_bind().dialect.name == "postgresql":
+            stmt = postgresql.insert(User).on_conflict_do_nothing()
+        else:
+            stmt = sqlite.insert(User).on_conflict_do_nothing()
+        result = await db.execute(
+            stmt.values(
+                email=obj_in.email,
+                username=obj_in.username,
+                full_name=obj_in.full_name,
+                hashed_password=hashed_password,
+            ).returning(User)
+        )
+        db_obj = result.scalar_one_or_none()
+        if db_obj is None:
+            return None
+        await db.commit()
+        return db_obj
+
     async def authenticate(
         self, db: AsyncSession, *, username: str, password: str
     ) -> Optional[User]:
         user = await self.get_by_username(db, username=username)
         if not user:
             return None
-        if not verify_password(password, str(user.hashed_password)):
+        if not await asyncio.to_thread(verify_password, password, str(user.hashed_password)):
             return None
         return user
 
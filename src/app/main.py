@@ -3,11 +3,13 @@ from fastapi import FastAPI,  HTTPException, status
 from app.routers import tasks, auth, files, monitoring
 from app.core.cache import cache_manager
 from app.core.config import settings
+from app.core.middleware import BodySizeLimitMiddleware, EmojiLoggingMiddleware
 from pydantic import BaseModel
-from typing import Any, List, cast
+from typing import List, cast
 import logging
 import sys
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 # Configure logging at application startup
 logging.basicConfig(
@@ -47,6 +49,8 @@ task_app = FastAPI(
     description="A comprehensive task management system built with FastAPI",
     version="1.0.0",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    # orjson serializes responses in C rather than through json.dumps
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -56,17 +60,13 @@ task_app.include_router(files.router, tags=["files"])
 task_app.include_router(monitoring.router, prefix="/monitoring", tags=["monitoring"])
 
 # custom middleware 
-@task_app.middleware("http")
-async def fun_middleware(
-    request: Any,
-    call_next: Any
-) -> Any:
-    emojis = ["🚀", "🔥", "✨", "🌟", "💥", "🎉", "😄", "🤖", "👾", "🛠️"]
-    import random
-    idx = random.randint(0, len(emojis) - 1)
-    logger.info( f" {" ".join(list(emojis[idx] * 3))} ")
-    response = await call_next(request)
-    return response
+task_app.add_middleware(EmojiLoggingMiddleware)
+# Stop oversize uploads before they are buffered
+task_app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_body_size=files.MAX_UPLOAD_BODY_SIZE,
+    path_prefixes=["/upload"],
+)
 
 # Cors Middleware
 # CORS middleware
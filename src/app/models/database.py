@@ -1,7 +1,7 @@
 
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -43,6 +43,18 @@ class Task(Base):
     # Relationship
     owner = relationship("User", back_populates="tasks")
 
+    __table_args__ = (
+        # Owner-scoped status filters and statistics become index-only scans on Postgres
+        Index("ix_tasks_owner_id_status", "owner_id", "status", postgresql_include=["priority"]),
+        # Same for the priority filter on the owner's task list
+        Index("ix_tasks_owner_id_priority", "owner_id", "priority"),
+        # created_at grows with insertion order, so a tiny BRIN index serves the /metrics recent-tasks subquery
+        Index("ix_tasks_created_at_brin", "created_at", postgresql_using="brin"),
+        # Trigram GIN indexes let Postgres serve the '%term%' ILIKE search without a sequential scan
+        Index("ix_tasks_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_tasks_description_trgm", "description", postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
+    )
+
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
@@ -1,4 +1,3 @@
-from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.security import OAuth2PasswordRequestForm
@@ -7,14 +6,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
 from app.core import security
-from app.core.config import settings
 from app.crud.user import user as crud_user
 from app.models.user import UserCreate, UserResponse, UserLogin
-from app.models.database import User
 
 
 router = APIRouter()
 
+# Refresh token cookie lifetime in seconds
+REFRESH_TOKEN_MAX_AGE = int(security.REFRESH_TOKEN_EXPIRES.total_seconds())
+
 @router.post("/login")
 async def login(
     *,
@@ -36,15 +36,12 @@ async def login(
     elif not crud_user.is_active(user):
         raise HTTPException(status_code=400, detail="Inactive user")
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = security.create_access_token(
-        user.username, expires_delta=access_token_expires
-    )
-
-
     refresh_token = await security.create_refresh_token(
         subject=str(user.id), db=db
     )
+    access_token = security.create_access_token(
+        user.username, expires_delta=security.ACCESS_TOKEN_EXPIRES
+    )
 
     response.set_cookie(
         key="refresh_token",
@@ -52,7 +49,7 @@ async def login(
         httponly=True,
         samesite="lax",
         secure=False,
-        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+        max_age=REFRESH_TOKEN_MAX_AGE,
 
     )
     return {
@@ -81,9 +78,8 @@ async def login_access_token(
     elif not crud_user.is_active(user):
         raise HTTPException(status_code=400, detail="Inactive user")
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
-        user.username, expires_delta=access_token_expires
+        user.username, expires_delta=security.ACCESS_TOKEN_EXPIRES
     )
 
     return {
@@ -100,24 +96,27 @@ async def create_user(
     """
     Create new user.
     """
-    user = await crud_user.get_by_email(db, email=user_in.email)
+    user = await crud_user.create_if_absent(db, obj_in=user_in)
     if user:
+        return user
+
+    # The email or username is taken - find out which
+    existing = await crud_user.get_by_email_or_username(
+        db, email=user_in.email, username=user_in.username
+    )
+    if existing and existing.email == user_in.email:
         raise HTTPException(
             status_code=400,
             detail="The user with this email already exists in the system."
         )
-    user = await crud_user.get_by_username(db, username=user_in.username)
-    if user:
-        raise HTTPException(
-            status_code=400,
-            detail="The user with this username already exists in the system."
-        )
-    user = await crud_user.create(db, obj_in=user_in)
-    return user
+    raise HTTPException(
+        status_code=400,
+        detail="The user with this username already exists in the system."
+    )
 
 @router.get("/me", response_model=UserResponse)
 async def read_user_me(
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get current user.
@@ -136,31 +135,30 @@ class TokenRefreshResponse(BaseModel):
 async def refresh_token(
     request: Request,
     response: Response,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_active_user),
     db: AsyncSession = Depends(deps.get_db)
 ) -> Any:
     """
     Refresh access token for current user.
     """
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = security.create_access_token(
-        current_user.username, expires_delta=access_token_expires
-    )
-
     rt_string = request.cookies.get("refresh_token")
     if not rt_string:
         raise HTTPException(status_code=401, detail="Refresh token missing")
-    
+
     rt = await security.verify_refresh_token(
         token=rt_string, db=db
     )
 
     if rt is None or rt.user_id != current_user.id:
-        raise HTTPException(status_code=401, detail="Invalid refresh token")    
-    
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
 
     new_refresh_token = await security.create_refresh_token(
         subject=str(current_user.id), db=db, old_rt=rt )
+
+    # Only sign once the refresh token has checked out
+    access_token = security.create_access_token(
+        current_user.username, expires_delta=security.ACCESS_TOKEN_EXPIRES
+    )
     
     response.set_cookie(
         key="refresh_token",
@@ -168,7 +166,7 @@ async def refresh_token(
         httponly=True,
         samesite="lax",
         secure=False,
-        max_age=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
+        max_age=REFRESH_TOKEN_MAX_AGE,
     )
 
     return {
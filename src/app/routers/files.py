@@ -1,9 +1,11 @@
 
+import asyncio
+import contextlib
 import os
-import aiofiles
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+import uuid
+from typing import BinaryIO, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
 from fastapi.responses import FileResponse
-from app.models.database import User
 from app.api import deps
 
 router = APIRouter()
@@ -11,6 +13,9 @@ router = APIRouter()
 UPLOAD_DIR = "uploads"
 ALLOWED_EXTENSIONS = {".txt", ".pdf", ".png", ".jpg", ".jpeg", ".gif", ".doc", ".docx"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+CHUNK_SIZE = 64 * 1024
+# Request body cap for /upload, leaving room for multipart framing around the file
+MAX_UPLOAD_BODY_SIZE = MAX_FILE_SIZE + 64 * 1024
 
 # Create upload directory if it do  esn't exist
 os.makedirs(UPLOAD_DIR, exist_ok=True)
@@ -18,12 +23,43 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 def allowed_file(filename: str) -> bool:
     return any(filename.lower().endswith(ext) for ext in ALLOWED_EXTENSIONS)
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def _save_upload(src: BinaryIO, path: str, max_size: int) -> Optional[int]:
+    """
+    Copy an upload to path in chunks, returning its size.
+    Returns None without touching path if it exceeds max_size.
+    """
+    # Write to a hidden temp file and move it into place, so an oversize
+    # upload never clobbers an existing file. Created with os.open rather than
+    # mkstemp so the mode follows the umask instead of being forced to 0600
+    tmp_path = os.path.join(os.path.dirname(path), f".upload-{uuid.uuid4().hex}")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        size = 0
+        with os.fdopen(fd, "wb") as f:
+            while chunk := src.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_size:
+                    return None
+                f.write(chunk)
+        os.replace(tmp_path, path)
+        return size
+    finally:
+        # Already gone if it was moved into place
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+
 
 
 @router.post("/upload")
 async def upload_file(
     file: UploadFile = File(...),
-    current_user: User = Depends(deps.get_current_active_user)
+    current_user: deps.CurrentUser = Depends(deps.get_current_active_user)
 ) -> dict[str, str | int]:
     """ Upload File """
 
@@ -33,82 +69,93 @@ async def upload_file(
     if not allowed_file(file.filename):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}")
     
-    content = await file.read()
+    file_path = os.path.join(UPLOAD_DIR, f"{current_user.id}_{file.filename}")
+    # Stream to disk in one worker-thread hop, holding a single chunk in memory
+    file_size = await asyncio.to_thread(_save_upload, file.file, file_path, MAX_FILE_SIZE)
 
-    if len(content) > MAX_FILE_SIZE:
+    if file_size is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File size exceeds the maximum limit of {} bytes".format(MAX_FILE_SIZE))
     
-    file_path = os.path.join(UPLOAD_DIR, f"{current_user.id}_{file.filename}")
-    async with aiofiles.open(file_path, "wb") as f:
-        await f.write(content)
-    
     return {
         "filename": file.filename,
         "file_path": file_path,
         "message": "File uploaded successfully",
-        "file_size": len(content)
+        "file_size": file_size
     }
 
 @router.get("/download/{filename}")
 async def download_file(
     filename: str,
-    current_user: User = Depends(deps.get_current_active_user)
-) -> FileResponse:
+    request: Request,
+    current_user: deps.CurrentUser = Depends(deps.get_current_active_user)
+) -> Response:
     """
     Download a file uploaded by the current user.
-    Returns the actual file for download.
+    Returns the actual file for download, or 304 if the client's copy is current.
     """
     # Construct the file path with user ID prefix
-    file_path = os.path.join(UPLOAD_DIR, f"{int(current_user.id)}_{filename}")  # type: ignore[arg-type]
+    file_path = os.path.join(UPLOAD_DIR, f"{current_user.id}_{filename}")
 
-    # Check if file exists
-    if not os.path.exists(file_path):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, 
-            detail=f"File '{filename}' not found"
-        )
-    
     # Check if the file belongs to the current user (security check)
-    if not os.path.basename(file_path).startswith(f"{int(current_user.id)}_"):  # type: ignore[arg-type]
+    if not os.path.basename(file_path).startswith(f"{current_user.id}_"):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to access this file"
         )
-    
-    # Return the file as a downloadable response
+
+    # A single stat both checks existence and feeds the response headers
+    try:
+        stat_result = await asyncio.to_thread(os.stat, file_path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail=f"File '{filename}' not found"
+        )
+
+    etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=3600"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Return the file as a downloadable response; passing stat_result saves
+    # FileResponse a second stat
     return FileResponse(
         path=file_path,
         filename=filename,  # Name to use when downloading
-        media_type="application/octet-stream"  # Generic binary file type
+        media_type="application/octet-stream",  # Generic binary file type
+        stat_result=stat_result,
+        headers=headers,
     )
 
 @router.delete("/delete/{filename}")
 async def delete_file(
     filename: str,
-    current_user: User = Depends(deps.get_current_active_user)
+    current_user: deps.CurrentUser = Depends(deps.get_current_active_user)
 ) -> dict[str, str]:
     """
     Delete a file uploaded by the current user.
     """
     # Construct the file path with user ID prefix
-    file_path = os.path.join(UPLOAD_DIR, f"{int(current_user.id)}_{filename}")  # type: ignore[arg-type]
+    file_path = os.path.join(UPLOAD_DIR, f"{current_user.id}_{filename}")
 
-    # Check if file exists
-    if not os.path.exists(file_path):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, 
-            detail=f"File '{filename}' not found"
-        )
-    
     # Security check: ensure file belongs to current user
-    if not os.path.basename(file_path).startswith(f"{int(current_user.id)}_"):  # type: ignore[arg-type]
+    if not os.path.basename(file_path).startswith(f"{current_user.id}_"):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to delete this file"
         )
     
-    # Delete the file
-    os.remove(file_path)
+    # Delete the file - a missing file surfaces from the unlink itself,
+    # so there's no exists() check racing with it
+    try:
+        await asyncio.to_thread(os.unlink, file_path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail=f"File '{filename}' not found"
+        )
     
     return {
         "message": f"File '{filename}' deleted successfully"
@@ -116,12 +163,16 @@ async def delete_file(
 
 @router.get("/files")
 async def list_user_files(
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_active_user),
 ) -> dict[str, list[str]]:
     """List all files uploaded by the current user"""
+    prefix = f"{current_user.id}_"
     user_files: list[str] = []
-    if os.path.exists(UPLOAD_DIR):
-        all_files = os.listdir(UPLOAD_DIR)
-        user_files = [f for f in all_files if f.startswith(f"{current_user.id}_")]
+    try:
+        # scandir streams entries instead of building the full listing first
+        with os.scandir(UPLOAD_DIR) as entries:
+            user_files = [entry.name for entry in entries if entry.name.startswith(prefix)]
+    except FileNotFoundError:
+        pass
 
     return {"files": user_files}
@@ -1,17 +1,24 @@
-from typing import Any, Optional, cast
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional, cast
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
 from app.crud.task import task as crud_task
 from app.models.task import TaskCreate, TaskUpdate, TaskResponse, TaskPriority, TaskStatus
-from app.models.database import User
 from app.core.rate_limiter import rate_limiter_moderate, rate_limiter_strict
 from app.core.cache import cache_manager
 # from app.core.email import send_task_reminder_email
 
 router = APIRouter()
 
+async def _invalidate_task_caches(owner_id: int, task_id: Optional[int] = None) -> None:
+    """Drop the owner's cached task lists and statistics, plus the task itself if given"""
+    await cache_manager.invalidate(
+        keys=[f"task:{task_id}:{owner_id}"] if task_id is not None else [],
+        patterns=[f"tasks_by_owner:{owner_id}:*", f"stats:{owner_id}:*"],
+    )
+
 @router.get("/")
 async def read_tasks(
     db: AsyncSession = Depends(deps.get_db),
@@ -20,15 +27,15 @@ async def read_tasks(
     priority: Optional[TaskPriority] = Query(None, description="Filter by priority"),
     status: Optional[TaskStatus] = Query(None, description="Filter by status"),
     search: Optional[str] = Query(None, min_length=1, description="Search in title and description"),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_active_user),
     _: None = Depends(rate_limiter_strict),
-) -> dict[str, Any]:
+) -> ORJSONResponse:
     """Retrieve tasks with advanced filtering and caching."""
 
     # Try cache first for common queries
     tasks, total_count = await crud_task.get_tasks_by_owner_cached(
         db,
-        owner_id= cast(int, current_user.id),
+        owner_id= current_user.id,
         skip=skip,
         limit=limit,
         priority=priority,
@@ -36,22 +43,24 @@ async def read_tasks(
         search=search
     )
 
-    return {
+    # The task dicts are already plain data, so hand them straight to orjson
+    # instead of running them through response validation and jsonable_encoder
+    return ORJSONResponse({
         "tasks": tasks,
         "total": total_count,
         "page": (skip // limit) + 1,
         "pages": (total_count + limit - 1) // limit,
         "per_page": limit
-    }
+    })
 
 @router.get("/statistics")
 async def get_task_statistics(
     db: AsyncSession = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_active_user),
     _: None = Depends(rate_limiter_moderate),
 ) -> dict[str, int]:
     """Get task statistics for dashboard."""
-    stats = await crud_task.get_task_statistics(db, owner_id=cast(int, current_user.id))
+    stats = await crud_task.get_task_statistics(db, owner_id=current_user.id)
     return stats
 
 @router.post("/", response_model=TaskResponse, status_code=201)
@@ -60,17 +69,17 @@ async def create_task(
     db: AsyncSession = Depends(deps.get_db),
     task_in: TaskCreate,
     # background_tasks: BackgroundTasks,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_active_user),
     _: None = Depends(rate_limiter_strict),
 ) -> TaskResponse:
     """Create new task with background email notification."""
 
     task = await crud_task.create_with_owner(
-        db, obj_in=task_in, owner_id=cast(int, current_user.id)
+        db, obj_in=task_in, owner_id=current_user.id
     )
 
     # Clear user's task cache
-    await cache_manager.clear_pattern(f"tasks_by_owner:*:{current_user.id}:*")
+    await _invalidate_task_caches(current_user.id)
 
     # Send background email notification if due date is set
     # if task.due_date:
@@ -89,38 +98,27 @@ async def read_task(
     *,
     db: AsyncSession = Depends(deps.get_db),
     id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_active_user),
     _: None = Depends(rate_limiter_moderate),
-) -> TaskResponse:
+) -> Response:
     """Get task by ID with caching."""
 
-    # Try cache first
+    # Try cache first - it holds the serialized TaskResponse, so a hit skips validation
     cache_key = f"task:{id}:{current_user.id}"
-    cached_task = await cache_manager.get(cache_key)
+    cached_task = await cache_manager.get_bytes(cache_key)
     if cached_task:
-        return cached_task
+        return Response(content=cached_task, media_type="application/json")
 
     task = await crud_task.get(db, id=id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    if cast(int, task.owner_id) != cast(int, current_user.id):
+    if cast(int, task.owner_id) != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    # Cache the result with explicit type annotation
-    task_dict: dict[str, Any] = {
-        "id": task.id,
-        "title": task.title,
-        "description": task.description,
-        "priority": task.priority,
-        "status": task.status,
-        "due_date": task.due_date,
-        "created_at": task.created_at,
-        "updated_at": task.updated_at,
-        "owner_id": task.owner_id
-    }
-    await cache_manager.set(cache_key, task_dict, ttl=600)  # 10 minutes
+    payload = TaskResponse.model_validate(task).model_dump_json().encode()
+    await cache_manager.set_bytes(cache_key, payload, ttl=600)  # 10 minutes
 
-    return task
+    return Response(content=payload, media_type="application/json")
 
 @router.put("/{id}", response_model=TaskResponse)
 async def update_task(
@@ -128,7 +126,7 @@ async def update_task(
     db: AsyncSession = Depends(deps.get_db),
     id: int,
     task_in: TaskUpdate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_active_user),
     _: None = Depends(rate_limiter_moderate),
 ) -> TaskResponse:
     """Update a task and invalidate cache."""
@@ -136,14 +134,13 @@ async def update_task(
     task = await crud_task.get(db, id=id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    if cast(int, task.owner_id) != cast(int, current_user.id):
+    if cast(int, task.owner_id) != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
     task = await crud_task.update(db, db_obj=task, obj_in=task_in)
 
     # Invalidate caches
-    await cache_manager.delete(f"task:{id}:{current_user.id}")
-    await cache_manager.clear_pattern(f"tasks_by_owner:*:{current_user.id}:*")
+    await _invalidate_task_caches(current_user.id, id)
 
     return task
 
@@ -152,7 +149,7 @@ async def delete_task(
     *,
     db: AsyncSession = Depends(deps.get_db),
     id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: deps.CurrentUser = Depends(deps.get_current_active_user),
     _: None = Depends(rate_limiter_moderate),
 ) -> dict[str, str]:
     """Delete a task and clear cache."""
@@ -160,13 +157,12 @@ async def delete_task(
     task = await crud_task.get(db, id=id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    if cast(int, task.owner_id) != cast(int, current_user.id):
+    if cast(int, task.owner_id) != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    await crud_task.remove(db, id=id)
+    await crud_task.remove_obj(db, db_obj=task)
 
     # Clear caches
-    await cache_manager.delete(f"task:{id}:{current_user.id}")
-    await cache_manager.clear_pattern(f"tasks_by_owner:*:{current_user.id}:*")
+    await _invalidate_task_caches(current_user.id, id)
 
     return {"message": "Task deleted successfully"}
@@ -0,0 +1,151 @@
+"""
+    Tests for the cache_result decorator and its cache key generation.
+"""
+import asyncio
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import cache_manager
+from app.core.decorators import _background_writes, _generate_cache_key, _inflight, _skipped_params, cache_result
+from app.models.task import TaskPriority
+
+
+def test_cache_key_is_deterministic():
+    key1 = _generate_cache_key("get_tasks", "tasks", (), {"owner_id": 1, "limit": 10})
+    key2 = _generate_cache_key("get_tasks", "tasks", (), {"limit": 10, "owner_id": 1})
+    assert key1 == key2
+
+def test_cache_key_is_128_bit_hex():
+    key = _generate_cache_key("get_tasks", "tasks", (), {"owner_id": 1})
+    assert len(key) == 32
+    int(key, 16)
+
+def test_cache_key_changes_with_arguments():
+    key1 = _generate_cache_key("get_tasks", "tasks", (), {"owner_id": 1, "priority": TaskPriority.HIGH})
+    key2 = _generate_cache_key("get_tasks", "tasks", (), {"owner_id": 1, "priority": TaskPriority.LOW})
+    key3 = _generate_cache_key("get_tasks", "tasks", (), {"owner_id": 2, "priority": TaskPriority.HIGH})
+    assert len({key1, key2, key3}) == 3
+
+def test_skipped_params_cover_self_and_session():
+    async def method(self, db: AsyncSession, owner_id: int) -> None: ...  # type: ignore[no-untyped-def]
+    assert _skipped_params(method) == (frozenset({0, 1}), frozenset({"self", "db"}))
+
+def test_first_positional_arg_of_plain_function_is_part_of_key():
+    key1 = _generate_cache_key("get_task", "task", (1,), {})
+    key2 = _generate_cache_key("get_task", "task", (2,), {})
+    assert key1 != key2
+
+def test_only_database_sessions_are_left_out_of_key():
+    class ChatSession:
+        def __init__(self, name: str):
+            self.name = name
+
+        def __str__(self) -> str:
+            return self.name
+
+    key1 = _generate_cache_key("get_chat", "chat", (ChatSession("a"),), {})
+    key2 = _generate_cache_key("get_chat", "chat", (ChatSession("b"),), {})
+    assert key1 != key2
+
+    session_key = _generate_cache_key("get_chat", "chat", (), {"db": object.__new__(AsyncSession)})
+    assert session_key == _generate_cache_key("get_chat", "chat", (), {})
+
+async def test_concurrent_misses_are_coalesced():
+    calls = 0
+
+    @cache_result(ttl=60, key_prefix="test_coalesce")
+    async def slow_lookup(owner_id: int) -> list[int]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [owner_id]
+
+    results = await asyncio.gather(*(slow_lookup(owner_id=1) for _ in range(5)))
+    assert results == [[1]] * 5
+    assert calls == 1
+
+async def test_waiter_recomputes_when_leader_is_cancelled():
+    calls = 0
+
+    @cache_result(ttl=60, key_prefix="test_leader_cancelled")
+    async def slow_lookup(owner_id: int) -> list[int]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [owner_id]
+
+    leader = asyncio.create_task(slow_lookup(owner_id=1))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(slow_lookup(owner_id=1))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await waiter == [1]
+    assert leader.cancelled()
+    assert calls == 2
+    assert not _inflight
+
+async def test_none_results_are_not_cached(monkeypatch):
+    cached: list[str] = []
+
+    async def fake_set(key: str, value: object, ttl: int = 3600) -> bool:
+        cached.append(key)
+        return True
+
+    monkeypatch.setattr(cache_manager, "set", fake_set)
+
+    @cache_result(ttl=60, key_prefix="test_none")
+    async def lookup(owner_id: int) -> list[int] | None:
+        return [owner_id] if owner_id else None
+
+    assert await lookup(owner_id=0) is None
+    assert await lookup(owner_id=1) == [1]
+    await asyncio.gather(*_background_writes)
+    assert len(cached) == 1
+
+async def test_inflight_entry_released_before_cache_write(monkeypatch):
+    inflight_during_set: list[bool] = []
+
+    async def fake_set(key: str, value: object, ttl: int = 3600) -> bool:
+        inflight_during_set.append(key in _inflight)
+        return True
+
+    monkeypatch.setattr(cache_manager, "set", fake_set)
+
+    @cache_result(ttl=60, key_prefix="test_release")
+    async def lookup(owner_id: int) -> list[int]:
+        return [owner_id]
+
+    assert await lookup(owner_id=1) == [1]
+    assert not _inflight
+    await asyncio.gather(*_background_writes)
+    assert inflight_during_set == [False]
+    assert not _background_writes
+
+def test_scope_must_be_keyword_only():
+    with pytest.raises(TypeError):
+        @cache_result(ttl=60, key_prefix="test_scope", scope="owner_id")
+        async def positional(owner_id: int) -> list[int]:
+            return [owner_id]
+
+    with pytest.raises(TypeError):
+        @cache_result(ttl=60, key_prefix="test_scope", scope="missing")
+        async def unknown(*, owner_id: int) -> list[int]:
+            return [owner_id]
+
+async def test_scope_value_leads_the_key(monkeypatch):
+    cached: list[str] = []
+
+    async def fake_set(key: str, value: object, ttl: int = 3600) -> bool:
+        cached.append(key)
+        return True
+
+    monkeypatch.setattr(cache_manager, "set", fake_set)
+
+    @cache_result(ttl=60, key_prefix="test_scope", scope="owner_id")
+    async def lookup(db: AsyncSession, *, owner_id: int = 7) -> list[int]:
+        return [owner_id]
+
+    await lookup(object.__new__(AsyncSession), owner_id=3)
+    await lookup(object.__new__(AsyncSession))
+    await asyncio.gather(*_background_writes)
+    assert [key.rsplit(":", 1)[0] for key in cached] == ["test_scope:3", "test_scope:7"]
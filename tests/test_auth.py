@@ -1,7 +1,8 @@
 import pytest
 from httpx import AsyncClient
-# from sqlalchemy.ext.asyncio import AsyncSession
-# from app.crud.user import user as crud_user
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud.user import user as crud_user
+from app.models.user import UserCreate
 
 @pytest.mark.asyncio
 async def test_register_user(client: AsyncClient):
@@ -20,6 +21,39 @@ async def test_register_user(client: AsyncClient):
     assert data["email"] == "newuser@example.com"
     assert "password" not in data
 
+@pytest.mark.asyncio
+async def test_register_duplicate_user(client: AsyncClient, test_user): # type: ignore[unused-argument]
+    base = {"password": "NewPassword123", "full_name": "New User"}
+    response = await client.post(
+        "/auth/register",
+        json={**base, "username": "testuser", "email": "test@example.com"}
+    )
+    assert response.status_code == 400
+    assert "email" in response.json()["detail"]
+
+    response = await client.post(
+        "/auth/register",
+        json={**base, "username": "testuser", "email": "other@example.com"}
+    )
+    assert response.status_code == 400
+    assert "username" in response.json()["detail"]
+
+@pytest.mark.asyncio
+async def test_create_if_absent_returns_none_on_conflict(db: AsyncSession, test_user): # type: ignore[unused-argument]
+    user_in = UserCreate(
+        username="testuser",
+        email="other@example.com",
+        password="TestPassword123",
+    )
+    assert await crud_user.create_if_absent(db, obj_in=user_in) is None
+
+    # The conflict is skipped rather than raised, so the session is still usable
+    user_in = UserCreate(username="otheruser", email="other@example.com", password="TestPassword123")
+    user = await crud_user.create_if_absent(db, obj_in=user_in)
+    assert user is not None
+    assert user.id is not None
+    assert user.created_at is not None
+
 @pytest.mark.asyncio
 async def test_login_user(client: AsyncClient, test_user): # type: ignore[unused-argument]
     response = await client.post(
@@ -54,3 +88,33 @@ async def test_get_current_user(client: AsyncClient, test_user): # type: ignore[
     assert response.status_code == 200
     data = response.json()
     assert data["username"] == "testuser"
+
+@pytest.mark.asyncio
+async def test_refresh_token_rotation(client: AsyncClient, test_user): # type: ignore[unused-argument]
+    # Login with JSON to get an access token and the refresh token cookie
+    login_response = await client.post(
+        "/auth/login",
+        json={"username": "testuser", "password": "TestPassword123"}
+    )
+    assert login_response.status_code == 200
+    token = login_response.json()["access_token"]
+    old_refresh_token = login_response.cookies["refresh_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # Refresh rotates the refresh token
+    response = await client.get(
+        "/auth/refresh",
+        headers=headers,
+        cookies={"refresh_token": old_refresh_token}
+    )
+    assert response.status_code == 200
+    assert "access_token" in response.json()
+    assert response.cookies["refresh_token"] != old_refresh_token
+
+    # The old refresh token has been revoked
+    response = await client.get(
+        "/auth/refresh",
+        headers=headers,
+        cookies={"refresh_token": old_refresh_token}
+    )
+    assert response.status_code == 401
@@ -0,0 +1,122 @@
+import os
+import stat
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from app.routers import files
+
+
+@pytest_asyncio.fixture
+async def headers(client: AsyncClient, test_user) -> dict[str, str]: # type: ignore[unused-argument]
+    login_response = await client.post(
+        "/auth/login/access-token",
+        data={"username": "testuser", "password": "TestPassword123"}
+    )
+    token = login_response.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path, monkeypatch) -> str:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr(files, "UPLOAD_DIR", str(tmp_path))
+    return str(tmp_path)
+
+@pytest.mark.asyncio
+async def test_upload_file(client: AsyncClient, headers: dict[str, str], upload_dir: str):
+    content = b"x" * (3 * files.CHUNK_SIZE + 123)
+    response = await client.post("/upload", files={"file": ("notes.txt", content)}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["file_size"] == len(content)
+
+    (saved,) = os.listdir(upload_dir)
+    assert saved.endswith("_notes.txt")
+    path = os.path.join(upload_dir, saved)
+    with open(path, "rb") as f:
+        assert f.read() == content
+
+    # Permissions follow the umask like a plain open() would
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+@pytest.mark.asyncio
+async def test_upload_oversize_file_leaves_nothing_behind(client: AsyncClient, headers: dict[str, str], upload_dir: str):
+    response = await client.post("/upload", files={"file": ("notes.txt", b"small")}, headers=headers)
+    assert response.status_code == 200
+
+    response = await client.post(
+        "/upload",
+        files={"file": ("notes.txt", b"x" * (files.MAX_FILE_SIZE + 1))},
+        headers=headers
+    )
+    assert response.status_code == 400
+
+    # No partial temp file, and the existing upload is untouched
+    (saved,) = os.listdir(upload_dir)
+    with open(os.path.join(upload_dir, saved), "rb") as f:
+        assert f.read() == b"small"
+
+def _multipart_chunks(filename: str, size: int):  # type: ignore[no-untyped-def]
+    """Multipart body for a single file, streamed without a Content-Length"""
+    async def chunks():  # type: ignore[no-untyped-def]
+        yield f'--b\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n\r\n'.encode()
+        remaining = size
+        while remaining > 0:
+            chunk = min(remaining, files.CHUNK_SIZE)
+            yield b"x" * chunk
+            remaining -= chunk
+        yield b"\r\n--b--\r\n"
+    return chunks()
+
+@pytest.mark.asyncio
+async def test_upload_rejects_oversize_content_length(client: AsyncClient, headers: dict[str, str], upload_dir: str):
+    response = await client.post(
+        "/upload",
+        files={"file": ("big.txt", b"x" * (files.MAX_UPLOAD_BODY_SIZE + 1))},
+        headers=headers
+    )
+    assert response.status_code == 413
+    assert os.listdir(upload_dir) == []
+
+@pytest.mark.asyncio
+async def test_upload_rejects_oversize_chunked_body(client: AsyncClient, headers: dict[str, str], upload_dir: str):
+    response = await client.post(
+        "/upload",
+        content=_multipart_chunks("big.txt", files.MAX_UPLOAD_BODY_SIZE + 1),
+        headers={**headers, "Content-Type": "multipart/form-data; boundary=b"}
+    )
+    assert response.status_code == 413
+    assert os.listdir(upload_dir) == []
+
+@pytest.mark.asyncio
+async def test_upload_accepts_chunked_body_under_limit(client: AsyncClient, headers: dict[str, str], upload_dir: str):
+    response = await client.post(
+        "/upload",
+        content=_multipart_chunks("small.txt", 2 * files.CHUNK_SIZE),
+        headers={**headers, "Content-Type": "multipart/form-data; boundary=b"}
+    )
+    assert response.status_code == 200
+    assert response.json()["file_size"] == 2 * files.CHUNK_SIZE
+
+@pytest.mark.asyncio
+async def test_download_file_etag(client: AsyncClient, headers: dict[str, str]):
+    await client.post("/upload", files={"file": ("notes.txt", b"hello")}, headers=headers)
+
+    response = await client.get("/download/notes.txt", headers=headers)
+    assert response.status_code == 200
+    assert response.content == b"hello"
+    etag = response.headers["etag"]
+
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = await client.get("/download/notes.txt", headers={**headers, "If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    response = await client.get("/download/notes.txt", headers={**headers, "If-None-Match": '"other"'})
+    assert response.status_code == 200
+    assert response.content == b"hello"
+
+@pytest.mark.asyncio
+async def test_download_missing_file(client: AsyncClient, headers: dict[str, str]):
+    response = await client.get("/download/missing.txt", headers=headers)
+    assert response.status_code == 404
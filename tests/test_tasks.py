@@ -82,3 +82,81 @@ async def test_update_task(client: AsyncClient, test_user): # type: ignore[unuse
     data = response.json()
     assert data["title"] == "Updated Title"
     assert data["status"] == "completed"
+
+@pytest.mark.asyncio
+async def test_delete_task(client: AsyncClient, test_user): # type: ignore[unused-argument]
+    # Setup
+    login_response = await client.post(
+        "/auth/login/access-token",
+        data={"username": "testuser", "password": "TestPassword123"}
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    create_response = await client.post(
+        "/tasks/",
+        json={"title": "Delete Me"},
+        headers=headers
+    )
+    task_id = create_response.json()["id"]
+
+    response = await client.delete(f"/tasks/{task_id}", headers=headers)
+    assert response.status_code == 200
+
+    response = await client.get(f"/tasks/{task_id}", headers=headers)
+    assert response.status_code == 404
+
+    response = await client.delete(f"/tasks/{task_id}", headers=headers)
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_read_task(client: AsyncClient, test_user): # type: ignore[unused-argument]
+    # Setup
+    login_response = await client.post(
+        "/auth/login/access-token",
+        data={"username": "testuser", "password": "TestPassword123"}
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    create_response = await client.post(
+        "/tasks/",
+        json={"title": "Read Me", "priority": "high"},
+        headers=headers
+    )
+    task_id = create_response.json()["id"]
+
+    response = await client.get(f"/tasks/{task_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    data = response.json()
+    assert data["id"] == task_id
+    assert data["title"] == "Read Me"
+    assert data["priority"] == "high"
+    assert data["status"] == "pending"
+
+    response = await client.get(f"/tasks/{task_id + 1}", headers=headers)
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_get_task_statistics(client: AsyncClient, test_user): # type: ignore[unused-argument]
+    # Setup
+    login_response = await client.post(
+        "/auth/login/access-token",
+        data={"username": "testuser", "password": "TestPassword123"}
+    )
+    token = login_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # Create tasks
+    await client.post("/tasks/", json={"title": "Urgent Task", "priority": "urgent"}, headers=headers)
+    await client.post("/tasks/", json={"title": "High Task", "priority": "high"}, headers=headers)
+
+    # Get statistics
+    response = await client.get("/tasks/statistics", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_tasks"] == 2
+    assert data["pending_tasks"] == 2
+    assert data["high_priority_tasks"] == 1
+    assert data["urgent_tasks"] == 1